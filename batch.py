@@ -0,0 +1,179 @@
+"""Pre-generates quizzes, flashcards and enhanced notes for every document in a course folder.
+
+Usage:
+    python batch.py path/to/course
+    python batch.py storage:username/chat-name --tasks quiz flashcards
+
+Outputs are written next to each document (lecture.pdf.quiz.json, lecture.pdf.flashcards.json,
+lecture.pdf.notes.md and lecture.pdf.notes.docx). Documents whose outputs already exist are skipped,
+so an interrupted run resumes where it stopped.
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from database import supabase_client as supabase
+from documents import BUCKET_NAME, extract_text, is_document, list_folder
+from flashcards import generate_flashcards, parse_flashcards
+from gemini import get_model
+from notes import ANALYSIS_FAILED, create_docx, enhance_notes
+from quiz import generate_quiz
+import argparse
+import json
+import os
+import sys
+
+MODEL_NAME = "gemini-1.5-flash"
+STORAGE_SCHEME = "storage:"
+
+# Output files per task; a task is complete once its last output exists
+TASK_OUTPUTS = {
+    "quiz": (".quiz.json",),
+    "flashcards": (".flashcards.json",),
+    "notes": (".notes.md", ".notes.docx"),
+}
+
+
+class LocalFolder:
+    """Course folder on the local filesystem."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def list_documents(self):
+        return sorted(
+            name for name in os.listdir(self.path)
+            if is_document(name) and os.path.isfile(os.path.join(self.path, name))
+        )
+
+    def read(self, name):
+        with open(os.path.join(self.path, name), "rb") as document:
+            return document.read()
+
+    def exists(self, name):
+        return os.path.exists(os.path.join(self.path, name))
+
+    def write(self, name, data):
+        # Write then rename so an interrupted run never leaves a partial output behind
+        path = os.path.join(self.path, name)
+        with open(f"{path}.tmp", "wb") as output:
+            output.write(data)
+        os.replace(f"{path}.tmp", path)
+
+
+class StorageFolder:
+    """Course folder under a prefix of the Supabase documents bucket.
+
+    Holds no client so it can be sent to extraction processes, which download on their own.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix.strip("/") + "/"
+        self.names = {file["name"] for file in list_folder(self.prefix)}
+
+    @property
+    def bucket(self):
+        return supabase.storage.from_(BUCKET_NAME)
+
+    def list_documents(self):
+        return sorted(name for name in self.names if is_document(name))
+
+    def read(self, name):
+        return self.bucket.download(f"{self.prefix}{name}")
+
+    def exists(self, name):
+        return name in self.names
+
+    def write(self, name, data):
+        # Upsert so a step that failed halfway can be rewritten on the next run
+        self.bucket.upload(f"{self.prefix}{name}", data, {"upsert": "true"})
+        self.names.add(name)
+
+
+def open_folder(source):
+    if source.startswith(STORAGE_SCHEME):
+        return StorageFolder(source[len(STORAGE_SCHEME):])
+    if not os.path.isdir(source):
+        raise SystemExit(f"Not a directory: {source}")
+    return LocalFolder(source)
+
+
+def extract_document(folder, name):
+    """Reads and extracts one document inside an extraction process."""
+    return extract_text(name, folder.read(name))
+
+
+def run_task(task, text, args):
+    """Runs one generation task and returns {output suffix: bytes}.
+
+    Raises ValueError when the model output could not be parsed, so nothing is written
+    and the step is retried on the next run.
+    """
+    if task == "quiz":
+        quiz = generate_quiz(get_model(MODEL_NAME), text, args.questions)
+        if not quiz:
+            raise ValueError("no questions could be parsed from the model output")
+        return {".quiz.json": json.dumps(quiz, indent=2).encode("utf-8")}
+    if task == "flashcards":
+        cards = parse_flashcards(generate_flashcards(get_model(MODEL_NAME), text))
+        if not cards:
+            raise ValueError("no flashcards could be parsed from the model output")
+        flashcards = [{"question": front, "answer": back} for front, back in cards]
+        return {".flashcards.json": json.dumps(flashcards, indent=2).encode("utf-8")}
+    enhanced_notes = enhance_notes(text, args.notes_prompt)
+    if not enhanced_notes or not enhanced_notes.strip() or enhanced_notes == ANALYSIS_FAILED:
+        raise ValueError("the model returned no enhanced notes")
+    return {".notes.md": enhanced_notes.encode("utf-8"), ".notes.docx": create_docx(enhanced_notes)}
+
+
+def pending_tasks(folder, document, tasks):
+    return [task for task in tasks if not folder.exists(document + TASK_OUTPUTS[task][-1])]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help=f"local folder or {STORAGE_SCHEME}<user>/<chat> storage prefix")
+    parser.add_argument("--tasks", nargs="+", choices=list(TASK_OUTPUTS), default=list(TASK_OUTPUTS))
+    parser.add_argument("--questions", type=int, default=10, help="questions per quiz")
+    parser.add_argument("--notes-prompt", default="Summarize key concepts and explain acronyms.")
+    parser.add_argument("--extract-workers", type=int, default=os.cpu_count(), help="processes for text extraction")
+    parser.add_argument("--concurrency", type=int, default=4, help="model calls in flight at once")
+    args = parser.parse_args(argv)
+
+    folder = open_folder(args.source)
+    work = {document: pending_tasks(folder, document, args.tasks) for document in folder.list_documents()}
+    work = {document: tasks for document, tasks in work.items() if tasks}
+    print(f"{len(work)} document(s) to process", file=sys.stderr)
+
+    failures = 0
+    with ProcessPoolExecutor(max_workers=args.extract_workers) as extract_pool, \
+            ThreadPoolExecutor(max_workers=args.concurrency) as model_pool:
+        running = {
+            extract_pool.submit(extract_document, folder, document): (document, None)
+            for document in work
+        }
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                document, task = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failures += 1
+                    print(f"✗ {document} {task or 'extraction'}: {e}", file=sys.stderr)
+                    continue
+
+                if task is None:
+                    for task in work[document]:
+                        running[model_pool.submit(run_task, task, result, args)] = (document, task)
+                    continue
+
+                # Outputs are written from this thread only, in order, so the last one marks completion
+                for suffix in TASK_OUTPUTS[task]:
+                    folder.write(document + suffix, result[suffix])
+                print(f"✓ {document} {task}", file=sys.stderr)
+
+    if failures:
+        print(f"{failures} step(s) failed; rerun to retry them", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fakes import notes_text
+from notes import create_docx
+
+LINES = 10_000
+# The in-memory export must take at most this fraction of the previous implementation's time
+MAX_RATIO = 0.5
+
+
+def legacy_create_docx(text):
+    """Previous create_docx: per-line regex compilation, style lookup by name and a file on disk."""
+    from docx import Document
+
+    doc = Document()
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            doc.add_paragraph("")
+            continue
+        if line.startswith("# "):
+            doc.add_heading(line[2:], level=1)
+            continue
+        elif line.startswith("## "):
+            doc.add_heading(line[3:], level=2)
+            continue
+        elif line.startswith("### "):
+            doc.add_heading(line[4:], level=3)
+            continue
+        elif line.startswith(("- ", "* ")):
+            doc.add_paragraph(line[2:], style="ListBullet")
+            continue
+        elif re.match(r"^\d+\.\s", line):
+            doc.add_paragraph(line, style="ListNumber")
+            continue
+        para = doc.add_paragraph()
+        pattern = re.compile(r"(\*\*.*?\*\*|\*.*?\*)")
+        for part in pattern.split(line):
+            if part.startswith("**") and part.endswith("**"):
+                para.add_run(part[2:-2]).bold = True
+            elif part.startswith("*") and part.endswith("*"):
+                para.add_run(part[1:-1]).italic = True
+            else:
+                para.add_run(part)
+    doc_path = "Enhanced_Notes.docx"
+    doc.save(doc_path)
+    with open(doc_path, "rb") as docx_file:
+        return docx_file.read()
+
+
+def timed_in_empty_dir(function, text):
+    """Runs function inside an empty directory; returns (seconds, bytes produced, files left on disk)."""
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            start = time.perf_counter()
+            docx_bytes = function(text)
+            elapsed = time.perf_counter() - start
+            written = os.listdir(workdir)
+        finally:
+            os.chdir(cwd)
+    return elapsed, len(docx_bytes), written
+
+
+def main():
+    import warnings
+
+    text = notes_text(LINES)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # the legacy path warns on every style_id lookup
+        legacy_elapsed, legacy_size, _ = timed_in_empty_dir(legacy_create_docx, text)
+    elapsed, size, written = timed_in_empty_dir(create_docx, text)
+
+    print(f"legacy create_docx: {LINES} lines in {legacy_elapsed:.3f}s, {legacy_size} bytes")
+    print(f"create_docx: {LINES} lines in {elapsed:.3f}s, {size} bytes ({elapsed / legacy_elapsed:.1%} of legacy)")
+    print(f"files written to disk: {len(written)}")
+    if written or elapsed > legacy_elapsed * MAX_RATIO:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
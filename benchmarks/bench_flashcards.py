@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fakes import flashcard_text
+from flashcards import CARDS_PER_PAGE, flip_card_css, flip_card_html, parse_flashcards, render_deck_html
+
+CARDS = 60
+
+
+def main():
+    cards = parse_flashcards(flashcard_text(CARDS))
+
+    # Previous behaviour: one markdown element per card, each carrying the full stylesheet
+    start = time.perf_counter()
+    per_card = [
+        flip_card_css + '<div class="flip-card-container">'
+        + flip_card_html.format(front_text=front, back_text=back) + "</div>"
+        for front, back in cards
+    ]
+    per_card_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    page = render_deck_html(cards[:CARDS_PER_PAGE])
+    deck_elapsed = time.perf_counter() - start
+
+    print(f"per-card: {len(per_card)} elements, {sum(map(len, per_card))} bytes, {per_card_elapsed * 1000:.2f}ms")
+    print(f"deck page: 1 element, {len(page)} bytes, {deck_elapsed * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported once the feature needing them is used
+HEAVY_MODULES = ("fitz", "google.generativeai", "supabase", "docx", "PyPDF2")
+# Budget for the cumulative time of `import main` once streamlit itself is already loaded
+BUDGET_US = 200_000
+
+
+def parse_importtime(stderr):
+    """Parses `python -X importtime` output into {module: (self_us, cumulative_us)}."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def main():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import streamlit; import main"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr.splitlines()[-1] if result.stderr else "import main failed")
+        sys.exit(1)
+
+    timings = parse_importtime(result.stderr)
+    eager = [name for name in HEAVY_MODULES if name in timings]
+    main_us = timings["main"][1]
+
+    print(f"import main: {main_us / 1000:.1f}ms (streamlit preloaded)")
+    if eager:
+        print(f"heavy modules imported eagerly: {', '.join(eager)}")
+    if eager or main_us > BUDGET_US:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Local stand-ins for Supabase and Gemini so the app can be exercised without credentials."""
+from collections import defaultdict
+from types import SimpleNamespace
+import threading
+import time
+
+
+class FakeBucket:
+    """In-memory storage bucket supporting the calls the app makes."""
+
+    def __init__(self, files, latency):
+        self._files = files
+        self._latency = latency
+
+    def upload(self, path, data, file_options=None):
+        time.sleep(self._latency)
+        self._files[path] = (bytes(data), time.time())
+
+    def download(self, path):
+        time.sleep(self._latency)
+        if path not in self._files:
+            raise FileNotFoundError(path)
+        return self._files[path][0]
+
+    def list(self, folder, options=None):
+        time.sleep(self._latency)
+        options = options or {}
+        offset = options.get("offset", 0)
+        entries = [
+            {
+                "name": path[len(folder):],
+                "updated_at": f"{updated:.6f}",
+                "metadata": {"size": len(data)},
+            }
+            for path, (data, updated) in sorted(self._files.items())
+            if path.startswith(folder) and "/" not in path[len(folder):]
+        ]
+        return entries[offset:offset + options.get("limit", 100)]
+
+    def remove(self, paths):
+        time.sleep(self._latency)
+        for path in paths:
+            self._files.pop(path, None)
+
+
+class FakeStorage:
+    def __init__(self, latency):
+        self._buckets = defaultdict(dict)
+        self._latency = latency
+
+    def from_(self, bucket_name):
+        return FakeBucket(self._buckets[bucket_name], self._latency)
+
+
+class FakeQuery:
+    """Chainable table query mirroring the subset of the PostgREST builder used by the app."""
+
+    def __init__(self, rows, lock, latency):
+        self._rows = rows
+        self._lock = lock
+        self._latency = latency
+        self._columns = None
+        self._filters = []
+        self._order = None
+        self._limit = None
+        self._insert = None
+
+    def select(self, *columns):
+        self._columns = columns
+        return self
+
+    def eq(self, column, value):
+        self._filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def lt(self, column, value):
+        self._filters.append(lambda row: row.get(column) < value)
+        return self
+
+    def order(self, column, desc=False):
+        self._order = (column, desc)
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def insert(self, rows):
+        self._insert = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def execute(self):
+        time.sleep(self._latency)
+        with self._lock:
+            if self._insert is not None:
+                inserted = []
+                for row in self._insert:
+                    # Rows without an id get one from an identity sequence, as in Postgres
+                    inserted.append({"id": len(self._rows) + 1, **row})
+                    self._rows.append(inserted[-1])
+                return SimpleNamespace(data=inserted)
+            rows = [row for row in self._rows if all(match(row) for match in self._filters)]
+        if self._order:
+            column, desc = self._order
+            rows.sort(key=lambda row: row[column], reverse=desc)
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        if self._columns:
+            rows = [{column: row.get(column) for column in self._columns} for row in rows]
+        return SimpleNamespace(data=rows)
+
+
+class FakeAuth:
+    """Accepts any password for registered emails and returns their display name as metadata.
+
+    The signed-in user is kept per thread, so sessions served by one process do not see each other's login.
+    """
+
+    def __init__(self, latency):
+        self._users = {}
+        self._current = threading.local()
+        self._latency = latency
+
+    def add_user(self, email, display_name):
+        self._users[email] = SimpleNamespace(email=email, user_metadata={"display_name": display_name})
+
+    def sign_in_with_password(self, credentials):
+        time.sleep(self._latency)
+        user = self._users.get(credentials["email"])
+        if user is None:
+            raise ValueError("Invalid login credentials")
+        self._current.user = user
+        return SimpleNamespace(user=user)
+
+    def sign_up(self, credentials):
+        self.add_user(credentials["email"], credentials["options"]["data"]["display_name"])
+        return SimpleNamespace(user=self._users[credentials["email"]])
+
+    def get_user(self):
+        return SimpleNamespace(user=getattr(self._current, "user", None))
+
+
+class FakeSupabase:
+    """Stand-in for the Supabase client with auth, storage and table access; latency is per call in seconds."""
+
+    def __init__(self, latency=0.0):
+        self.auth = FakeAuth(latency)
+        self.storage = FakeStorage(latency)
+        self._tables = defaultdict(list)
+        self._lock = threading.Lock()
+        self._latency = latency
+
+    def table(self, name):
+        return FakeQuery(self._tables[name], self._lock, self._latency)
+
+
+def _response(text, prompt):
+    usage = SimpleNamespace(prompt_token_count=len(prompt.split()), candidates_token_count=len(text.split()))
+    return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+class FakeChat:
+    def __init__(self, model, history):
+        self._model = model
+        self.history = list(history or [])
+
+    def send_message(self, message):
+        response = self._model.generate_content(message)
+        self.history.append({"role": "user", "parts": [message]})
+        self.history.append({"role": "model", "parts": [response.text]})
+        return response
+
+
+class FakeGenerativeModel:
+    """Deterministic stand-in for genai.GenerativeModel.
+
+    responder(prompt) returns the response text; latency is in seconds per call.
+    """
+
+    def __init__(self, responder=None, latency=0.0):
+        self._responder = responder or (lambda prompt: f"Echo: {prompt[-80:]}")
+        self._latency = latency
+
+    def generate_content(self, prompt):
+        time.sleep(self._latency)
+        return _response(self._responder(prompt), prompt)
+
+    def start_chat(self, history=None):
+        return FakeChat(self, history)
+
+
+def quiz_text(questions):
+    """Builds a quiz response in the format generate_quiz asks Gemini for."""
+    blocks = []
+    for i in range(questions):
+        blocks.append(
+            f"Q: Question {i} about the document?\n"
+            f"A) First option {i}\nB) Second option {i}\nC) Third option {i}\nD) Fourth option {i}\n"
+            f"Correct: {'ABCD'[i % 4]}"
+        )
+    return "\n\n".join(blocks)
+
+
+def flashcard_text(cards):
+    """Builds a flashcard response in question/answer line pairs."""
+    lines = []
+    for i in range(cards):
+        lines.append(f"**Question {i}:** What does <term {i}> mean?")
+        lines.append(f"**Answer:** It means definition {i} & more.")
+    return "\n".join(lines)
+
+
+def notes_text(lines):
+    """Builds enhanced notes with every block type create_docx handles."""
+    blocks = [
+        "# Chapter heading",
+        "## Section heading",
+        "Plain text with **bold**, *italic* and `inline code` spans.",
+        "- Bullet point with **emphasis**",
+        "1. Numbered step",
+        "",
+        "```",
+        "def example():",
+        "```",
+        "### Sub-section",
+    ]
+    return "\n".join(blocks[i % len(blocks)] for i in range(lines))
+
+
+def canned_responder(prompt):
+    """Answers app prompts with well-formed quiz, flashcard or notes text based on the request."""
+    if "multiple-choice quiz" in prompt:
+        return quiz_text(10)
+    if prompt.startswith("Create flashcards"):
+        return flashcard_text(20)
+    if prompt.startswith("Analyze and enhance"):
+        return notes_text(200)
+    return "Here is an explanation of the concept you asked about."
+
+
+def pdf_bytes(pages, text="Lecture notes line."):
+    """Creates a PDF with the given number of text pages using PyMuPDF."""
+    import fitz
+
+    doc = fitz.open()
+    for page_number in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page {page_number}\n" + "\n".join([text] * 40))
+    data = doc.tobytes()
+    doc.close()
+    return data
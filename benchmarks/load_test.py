@@ -0,0 +1,295 @@
+"""Simulates concurrent students driving one Streamlit server against local stand-ins.
+
+Starts `streamlit run benchmarks/load_test_app.py`, which serves main.py against seeded stand-ins,
+then connects --users websocket clients to that single server process at once, as browsers would.
+Each client walks login -> select chat -> Load -> chat -> quiz -> flashcards, sending the widget
+states a browser sends and timing every rerun until the server reports the script finished.
+Memory is the resident set of the server process (read from /proc, so Linux only).
+
+Usage: python benchmarks/load_test.py [--users N] [--latency SECONDS] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.asyncio.client import connect
+
+from database import use_supabase_client
+from documents import BUCKET_NAME
+from fakes import FakeGenerativeModel, FakeSupabase, canned_responder, pdf_bytes
+from gemini import use_model_factory
+
+APP_PATH = os.path.join(ROOT, "benchmarks", "load_test_app.py")
+CHAT_NAME = "Course"
+DOCUMENTS = ("lecture1.pdf", "lecture2.pdf")
+# Seeding settings handed from the driver to the server process
+USERS_ENV = "LOAD_TEST_USERS"
+PAGES_ENV = "LOAD_TEST_PAGES"
+LATENCY_ENV = "LOAD_TEST_LATENCY"
+
+_backend_lock = threading.Lock()
+_backend_installed = False
+
+
+def seed_backend(client, users, pages):
+    """Registers the simulated students with one chat and a few lecture PDFs each."""
+    data = pdf_bytes(pages)
+    for user in range(users):
+        username = f"student{user}"
+        client.auth.add_user(f"{username}@example.com", username)
+        client.table("Chat-History").insert(
+            {"id": f"ID{user + 1:04d}", "name": CHAT_NAME, "displayname": username}
+        ).execute()
+        for document in DOCUMENTS:
+            client.storage.from_(BUCKET_NAME).upload(f"{username}/{CHAT_NAME}/{document}", data)
+
+
+def install_backend():
+    """Installs seeded stand-ins once per server process; load_test_app.py calls this on every rerun."""
+    global _backend_installed
+    with _backend_lock:
+        if _backend_installed:
+            return
+        latency = float(os.environ.get(LATENCY_ENV, "0"))
+        client = FakeSupabase(latency=latency)
+        model = FakeGenerativeModel(responder=canned_responder, latency=latency)
+        seed_backend(client, int(os.environ.get(USERS_ENV, "1")), int(os.environ.get(PAGES_ENV, "1")))
+        use_supabase_client(client)
+        use_model_factory(lambda model_name: model)
+        _backend_installed = True
+
+
+class Session:
+    """One simulated student on its own websocket; records the latency of every rerun it triggers."""
+
+    def __init__(self, user, websocket, timeout):
+        self.user = user
+        self.websocket = websocket
+        self.timeout = timeout
+        self.widgets = {}  # widget id -> (element type, element proto) shown by the last run
+        self.values = {}  # widget id -> WidgetState sent with every rerun, as the browser keeps them
+        self.rerun_ms = []
+        self.errors = []
+
+    def _widget(self, kind, label=None, key=None):
+        for widget_id, (element_type, element) in self.widgets.items():
+            if element_type != kind or (key is not None and not widget_id.endswith(f"-{key}")):
+                continue
+            if label is None or getattr(element, "label", None) == label:
+                return widget_id
+        raise LookupError(f"no {kind} {label or key!r} on the page")
+
+    async def _run(self, step, *triggers):
+        """Sends one rerun with the kept widget values plus one-shot triggers and waits for it to finish."""
+        message = BackMsg()
+        message.rerun_script.widget_states.widgets.extend([*self.values.values(), *triggers])
+        started = time.perf_counter()
+        await self.websocket.send(message.SerializeToString())
+        await asyncio.wait_for(self._receive(step), self.timeout)
+        self.rerun_ms.append((time.perf_counter() - started) * 1000)
+        # The browser forgets widgets that are no longer on the page
+        self.values = {widget_id: state for widget_id, state in self.values.items() if widget_id in self.widgets}
+
+    async def _receive(self, step):
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self.websocket.recv())
+            kind = message.WhichOneof("type")
+            if kind == "new_session":
+                self.widgets = {}
+            elif kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                element_type = message.delta.new_element.WhichOneof("type")
+                element = getattr(message.delta.new_element, element_type)
+                if element_type == "exception":
+                    self.errors.append(f"{step}: {element.message}")
+                elif getattr(element, "id", ""):
+                    self.widgets[element.id] = (element_type, element)
+            elif kind == "script_finished":
+                if message.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errors.append(f"{step}: script failed to compile")
+                if message.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return
+
+    async def click(self, step, label=None, key=None):
+        await self._run(step, WidgetState(id=self._widget("button", label, key), trigger_value=True))
+
+    def set_value(self, kind, label, **value):
+        """Keeps a widget value for the following reruns, as typing into the widget would."""
+        widget_id = self._widget(kind, label)
+        self.values[widget_id] = WidgetState(id=widget_id, **value)
+        return self.values[widget_id]
+
+    async def journey(self):
+        username = f"student{self.user}"
+        await self._run("open")
+        await self.click("login page", "Login")
+        self.set_value("text_input", "Enter your email", string_value=f"{username}@example.com")
+        self.set_value("text_input", "Enter your password", string_value="password")
+        await self.click("login", key="login_button")
+
+        self.set_value("selectbox", "Select a chat history:", string_value=CHAT_NAME)
+        await self._run("select chat")
+        await self.click("fetch documents", "🔄 Fetch Documents")
+        self.set_value("multiselect", "Choose documents:").string_array_value.data[:] = DOCUMENTS
+        await self._run("select documents")
+        await self.click("load", "📂 Load")
+
+        for turn in range(3):
+            question = WidgetState(id=self._widget("chat_input"))
+            question.chat_input_value.data = f"Explain topic {turn}"
+            await self._run(f"chat {turn}", question)
+
+        await self.click("quiz page", "📖 Quiz")
+        await self.click("generate quiz", "Generate Quiz")
+        await self.click("answer", "Save and Next")
+
+        await self.click("flashcards", "📖 Flash Cards")
+
+
+async def run_session(user, url, timeout):
+    """Drives one student over its own websocket connection."""
+    session = Session(user, None, timeout)
+    try:
+        async with connect(url, subprotocols=["streamlit"], max_size=None) as session.websocket:
+            await session.journey()
+    except Exception as e:
+        session.errors.append(f"aborted: {e!r}")
+    return session
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(port, args, log):
+    """Starts one headless streamlit server serving the app against seeded stand-ins."""
+    env = {**os.environ, USERS_ENV: str(args.users), PAGES_ENV: str(args.pages), LATENCY_ENV: str(args.latency)}
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", APP_PATH,
+            "--server.headless", "true",
+            "--server.address", "127.0.0.1",
+            "--server.port", str(port),
+            "--server.fileWatcherType", "none",
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=ROOT, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    deadline = time.monotonic() + args.timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("streamlit did not become healthy in time")
+
+
+def server_memory_kb(pid):
+    """Returns the current and peak resident set size of a process in KiB."""
+    with open(f"/proc/{pid}/status") as status:
+        fields = dict(line.split(":", 1) for line in status)
+    return int(fields["VmRSS"].split()[0]), int(fields["VmHWM"].split()[0])
+
+
+async def drive(url, args):
+    # Warm the server with one page load so app imports and seeding are not counted as session cost
+    async with connect(url, subprotocols=["streamlit"], max_size=None) as websocket:
+        await Session(None, websocket, args.timeout)._run("warm-up")
+    baseline_kb, _ = server_memory_kb(args.server_pid)
+
+    started = time.perf_counter()
+    sessions = await asyncio.gather(*(run_session(user, url, args.timeout) for user in range(args.users)))
+    elapsed = time.perf_counter() - started
+    return sessions, elapsed, baseline_kb
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] if ordered else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10, help="simulated students connected at once")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake Supabase/Gemini latency per call, seconds")
+    parser.add_argument("--pages", type=int, default=10, help="pages per lecture PDF")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per rerun")
+    parser.add_argument("--output", help="write results JSON to this file instead of stdout")
+    args = parser.parse_args()
+
+    port = free_port()
+    with tempfile.TemporaryFile() as log:
+        try:
+            server = start_server(port, args, log)
+        except RuntimeError:
+            log.seek(0)
+            sys.stderr.write(log.read().decode(errors="replace")[-4000:])
+            raise
+        try:
+            args.server_pid = server.pid
+            sessions, elapsed, baseline_kb = asyncio.run(drive(f"ws://127.0.0.1:{port}/_stcore/stream", args))
+            _, peak_kb = server_memory_kb(server.pid)
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    failed = [session for session in sessions if session.errors]
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "users": args.users,
+        "latency_s": args.latency,
+        "valid": not failed,
+        "elapsed_s": round(elapsed, 3),
+        "failed_sessions": len(failed),
+        "errors": [f"student{session.user} {error}" for session in failed for error in session.errors][:20],
+    }
+    # Timings from a run with failed sessions would describe a different workload, so omit them
+    if not failed:
+        rerun_ms = [sample for session in sessions for sample in session.rerun_ms]
+        report.update({
+            "sessions_per_s": round(args.users / elapsed, 3),
+            "reruns_per_s": round(len(rerun_ms) / elapsed, 3),
+            "rerun_p50_ms": round(statistics.median(rerun_ms), 3),
+            "rerun_p95_ms": round(percentile(rerun_ms, 0.95), 3),
+            "rerun_p99_ms": round(percentile(rerun_ms, 0.99), 3),
+            "server_baseline_rss_mb": round(baseline_kb / 1024, 3),
+            "server_peak_rss_mb": round(peak_kb / 1024, 3),
+            "server_rss_growth_mb_per_session": round((peak_kb - baseline_kb) / 1024 / args.users, 3),
+        })
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as results_file:
+            results_file.write(output + "\n")
+    else:
+        print(output)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+"""Streamlit entry point for load_test.py: serves main.py against seeded local stand-ins.
+
+Usage: streamlit run benchmarks/load_test_app.py (load_test.py starts it with the seeding settings)
+"""
+import os
+import sys
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+for path in (os.path.dirname(BENCHMARKS), BENCHMARKS):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import main
+from load_test import install_backend
+
+install_backend()
+main.main()
@@ -0,0 +1,157 @@
+"""Runs the offline benchmark scenarios against local stand-ins and writes JSON results.
+
+Usage: python benchmarks/run_benchmarks.py [--repeat N] [--latency SECONDS] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import use_supabase_client
+from fakes import FakeGenerativeModel, FakeSupabase, flashcard_text, notes_text, pdf_bytes, quiz_text
+from gemini import use_model_factory
+
+
+def load_pdfs(documents, pages, latency):
+    """Load button path: download and extract N PDFs with a cold extraction cache."""
+    from documents import BUCKET_NAME, clear_cache, load_document
+
+    client = FakeSupabase(latency=latency)
+    use_supabase_client(client)
+    data = pdf_bytes(pages)
+    paths = [f"student/Course/doc{i}.pdf" for i in range(documents)]
+    for path in paths:
+        client.storage.from_(BUCKET_NAME).upload(path, data)
+
+    def run():
+        clear_cache()
+        return sum(len(load_document(path)) for path in paths)
+
+    return run
+
+
+def parse_quiz(questions):
+    """extract_quiz_data on a large Gemini response."""
+    from quiz import extract_quiz_data
+
+    text = quiz_text(questions)
+    return lambda: len(extract_quiz_data(text))
+
+
+def render_flashcards(cards):
+    """Parse a flashcard response and render the first deck page."""
+    from flashcards import CARDS_PER_PAGE, parse_flashcards, render_deck_html
+
+    text = flashcard_text(cards)
+    return lambda: len(render_deck_html(parse_flashcards(text)[:CARDS_PER_PAGE]))
+
+
+def export_docx(lines):
+    """create_docx on enhanced notes of the given length."""
+    from notes import create_docx
+
+    text = notes_text(lines)
+    return lambda: len(create_docx(text))
+
+
+def chat_turns(turns, latency):
+    """Multi-turn chat through chat_with_gemini with a growing history."""
+    from chatbot import adjust_history_for_gemini, chat_with_gemini
+
+    model = FakeGenerativeModel(latency=latency)
+    use_model_factory(lambda model_name: model)
+
+    def run():
+        messages = []
+        for turn in range(turns):
+            question = f"Question {turn} about the document?"
+            messages.append({"role": "user", "content": question})
+            answer, _ = chat_with_gemini(question, adjust_history_for_gemini(messages), model)
+            messages.append({"role": "assistant", "content": answer})
+        return len(messages)
+
+    return run
+
+
+def scenarios(latency):
+    return [
+        ("load_pdfs", {"documents": 10, "pages": 20}, lambda: load_pdfs(10, 20, latency)),
+        ("extract_quiz_data", {"questions": 5000}, lambda: parse_quiz(5000)),
+        ("render_flashcards", {"cards": 600}, lambda: render_flashcards(600)),
+        ("create_docx", {"lines": 10_000}, lambda: export_docx(10_000)),
+        ("chat_turns", {"turns": 20}, lambda: chat_turns(20, latency)),
+    ]
+
+
+def measure(run, repeat):
+    """Times repeat calls of run and returns summary statistics in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000)
+    ordered = sorted(samples)
+    return {
+        "min_ms": round(ordered[0], 3),
+        "median_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 3),
+        "samples_ms": [round(sample, 3) for sample in samples],
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per scenario")
+    parser.add_argument("--latency", type=float, default=0.0, help="fake Supabase/Gemini latency per call, seconds")
+    parser.add_argument("--only", nargs="*", help="scenario names to run")
+    parser.add_argument("--output", help="write results JSON to this file instead of stdout")
+    args = parser.parse_args()
+
+    results = []
+    try:
+        for name, params, setup in scenarios(args.latency):
+            if args.only and name not in args.only:
+                continue
+            run = setup()
+            run()  # warm-up
+            results.append({"scenario": name, "params": params, **measure(run, args.repeat)})
+            print(f"{name}: median {results[-1]['median_ms']:.1f}ms", file=sys.stderr)
+    finally:
+        use_supabase_client(None)
+        use_model_factory(None)
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "latency_s": args.latency,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as results_file:
+            results_file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,91 @@
 import streamlit as st
+from database import supabase_client as supabase
+from metrics import record_usage, span
+
+# Messages are appended only; the identity id gives their order within a chat:
+#
+#   create table "Chat-Messages" (
+#       id bigint generated always as identity primary key,
+#       chat_id text not null references "Chat-History" (id) on delete cascade,
+#       role text not null,
+#       content text not null,
+#       created_at timestamptz not null default now()
+#   );
+#   create index "Chat-Messages_chat_id_id_idx" on "Chat-Messages" (chat_id, id desc);
+MESSAGES_TABLE = "Chat-Messages"
+MESSAGES_PAGE_SIZE = 30
+
+
+def load_messages(chat_id, before_id=None, limit=MESSAGES_PAGE_SIZE):
+    """Loads the newest page of messages older than before_id, oldest first, and whether more remain."""
+    query = supabase.table(MESSAGES_TABLE).select("id", "role", "content").eq("chat_id", chat_id)
+    if before_id is not None:
+        query = query.lt("id", before_id)
+    with span("supabase.table.chat_messages.select"):
+        response = query.order("id", desc=True).limit(limit + 1).execute()
+    rows = response.data if response.data else []
+    return list(reversed(rows[:limit])), len(rows) > limit
+
+
+def save_messages(rows):
+    """Appends message rows, each carrying its own chat_id, in a single batched insert."""
+    rows = [row for row in rows if row["chat_id"]]
+    if rows:
+        with span("supabase.table.chat_messages.insert"):
+            supabase.table(MESSAGES_TABLE).insert(rows).execute()
+
+
+def open_chat_transcript(chat_id):
+    """Replaces the session transcript with the most recent page of the selected chat."""
+    if st.session_state.get("pending_messages"):
+        flush_pending_messages()
+    messages, has_older = [], False
+    if chat_id:
+        try:
+            messages, has_older = load_messages(chat_id)
+        except Exception as e:
+            st.sidebar.error(f"Failed to load chat history: {e}")
+    st.session_state.messages = messages
+    st.session_state["messages_chat_id"] = chat_id
+    st.session_state["has_older_messages"] = has_older
+
+
+def load_older_messages():
+    """Prepends the previous page of the current chat to the session transcript."""
+    oldest_id = st.session_state.messages[0]["id"]
+    try:
+        messages, has_older = load_messages(st.session_state["messages_chat_id"], before_id=oldest_id)
+    except Exception as e:
+        st.error(f"Failed to load earlier messages: {e}")
+        return
+    st.session_state.messages = messages + st.session_state.messages
+    st.session_state["has_older_messages"] = has_older
+
+
+def append_message(role, content):
+    """Adds a message to the session transcript and queues it for the next batched write."""
+    st.session_state.messages.append({"role": role, "content": content})
+    st.session_state.setdefault("pending_messages", []).append(
+        {"chat_id": st.session_state.get("messages_chat_id"), "role": role, "content": content}
+    )
+
+
+def flush_pending_messages():
+    """Writes queued messages to the chats they were sent in, keeping them queued if the write fails."""
+    pending = st.session_state.get("pending_messages", [])
+    try:
+        save_messages(pending)
+        st.session_state["pending_messages"] = []
+    except Exception as e:
+        st.warning(f"Chat history could not be saved yet: {e}")
 
 # Function to communicate with Gemini API
 def chat_with_gemini(question, chat_history, model):
     """Handles chat conversation with Gemini API."""
     chat = model.start_chat(history=chat_history)
-    response = chat.send_message(question)
+    with span("gemini.chat"):
+        response = chat.send_message(question)
+    record_usage("gemini_chat", response)
     return response.text, chat.history
 
 # Function to format chat history for Gemini API
@@ -25,6 +106,10 @@ def chatbot_interface(model, document_text):
         with st.expander("📜 Document Context", expanded=True):
             st.text_area("Loaded Document", document_text, height=200, disabled=True)
 
+    # Older messages are only fetched when asked for, keeping reruns bounded
+    if st.session_state.get("has_older_messages") and st.button("⬆️ Load earlier messages"):
+        load_older_messages()
+
     # Display chat messages in a scrollable container
     with st.container():
         for message in st.session_state.messages:
@@ -40,7 +125,7 @@ def chatbot_interface(model, document_text):
             st.markdown(user_input)
 
         # Save user's message to session state
-        st.session_state.messages.append({"role": "user", "content": user_input})
+        append_message("user", user_input)
 
         # Generate response using Gemini API
         with st.chat_message("assistant"):
@@ -64,6 +149,9 @@ def chatbot_interface(model, document_text):
                 message_placeholder.markdown(full_response)
 
                 # Save assistant's response to session state
-                st.session_state.messages.append({"role": "assistant", "content": full_response})
+                append_message("assistant", full_response)
             except Exception as e:
                 st.error(f"Error in communication with Gemini API: {e}")
+
+        # Persist the whole exchange in one write
+        flush_pending_messages()
@@ -1,9 +1,33 @@
-from supabase import create_client
 from dotenv import load_dotenv
+from functools import lru_cache
 import os
 
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+_client_override = None
+
+
+@lru_cache(maxsize=None)
+def get_supabase_client():
+    """Creates the Supabase client on first use so importing this module stays cheap."""
+    from supabase import create_client
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+def use_supabase_client(client):
+    """Routes supabase_client to another client such as a local stand-in; None restores Supabase."""
+    global _client_override
+    _client_override = client
+
+
+class _LazyClient:
+    """Forwards attribute access to the Supabase client, creating it on first use."""
+
+    def __getattr__(self, name):
+        return getattr(_client_override or get_supabase_client(), name)
+
+
+supabase_client = _LazyClient()
@@ -0,0 +1,208 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from database import supabase_client as supabase
+from metrics import count, span
+import io
+import threading
+import time
+
+BUCKET_NAME = "user-documents"
+# Storage returns at most this many entries per list request
+LIST_PAGE_SIZE = 100
+# Files shown in the document picker; anything else in a chat folder is generated output
+DOCUMENT_SUFFIXES = (".pdf", ".txt")
+
+# Extracted text shared by all sessions of this process, evicted least recently used first
+CACHE_MAX_CHARS = 50_000_000
+# Prefetch limits per chat selection
+PREFETCH_MAX_DOCUMENTS = 3
+PREFETCH_MAX_FILE_BYTES = 20_000_000
+PREFETCH_MAX_BYTES_PER_SECOND = 2_000_000
+
+_cache = OrderedDict()
+_cache_chars = 0
+_cache_lock = threading.Lock()
+# Downloads in progress, so concurrent loads of one path share a single download
+_inflight = {}
+# Bumped by invalidate() so a download that started earlier does not cache stale text
+_generations = {}
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="prefetch")
+
+
+def _cache_get(file_path):
+    with _cache_lock:
+        text = _cache.get(file_path)
+        if text is not None:
+            _cache.move_to_end(file_path)
+        return text
+
+
+def _cache_put_locked(file_path, text):
+    global _cache_chars
+    if len(text) > CACHE_MAX_CHARS:
+        return
+    if file_path in _cache:
+        _cache_chars -= len(_cache.pop(file_path))
+    _cache[file_path] = text
+    _cache_chars += len(text)
+    while _cache_chars > CACHE_MAX_CHARS:
+        _, evicted = _cache.popitem(last=False)
+        _cache_chars -= len(evicted)
+
+
+def clear_cache():
+    """Drops all extracted text from the local cache."""
+    global _cache_chars
+    with _cache_lock:
+        _cache.clear()
+        _cache_chars = 0
+
+
+def invalidate(file_paths):
+    """Drops the cached text of documents that were uploaded again or deleted."""
+    global _cache_chars
+    with _cache_lock:
+        for file_path in file_paths:
+            _generations[file_path] = _generations.get(file_path, 0) + 1
+            _inflight.pop(file_path, None)
+            text = _cache.pop(file_path, None)
+            if text is not None:
+                _cache_chars -= len(text)
+
+
+def is_cached(file_path):
+    """Returns whether the extracted text of a document is already in the local cache."""
+    with _cache_lock:
+        return file_path in _cache
+
+
+def extract_text(file_name, data):
+    """Extracts text from a downloaded document, using PyMuPDF for PDFs."""
+    if file_name.lower().endswith(".pdf"):
+        import fitz  # PyMuPDF is only needed once documents are loaded
+
+        with span("pymupdf.extract"), fitz.open(stream=io.BytesIO(data), filetype="pdf") as pdf_reader:
+            return "\n\n".join([page.get_text() for page in pdf_reader])
+    return data.decode("utf-8")
+
+
+def load_document(file_path):
+    """Returns the extracted text of a stored document, downloading it only on a cache miss."""
+    text = _cache_get(file_path)
+    count("document_cache_hits" if text is not None else "document_cache_misses")
+    if text is None:
+        text, _ = _fetch(file_path)
+    return text
+
+
+def _fetch(file_path):
+    """Downloads and extracts a document into the cache, joining a download already in flight.
+
+    Returns the text and the number of bytes this call downloaded itself.
+    """
+    while True:
+        with _cache_lock:
+            text = _cache.get(file_path)
+            if text is not None:
+                return text, 0
+            pending = _inflight.get(file_path)
+            if pending is None:
+                pending = _inflight[file_path] = Future()
+                generation = _generations.get(file_path, 0)
+                break
+        try:
+            return pending.result(), 0
+        except Exception:
+            continue  # The other download failed; try it ourselves
+
+    try:
+        data = download(file_path)
+        text = extract_text(file_path, data)
+    except Exception as e:
+        with _cache_lock:
+            if _inflight.get(file_path) is pending:
+                del _inflight[file_path]
+        pending.set_exception(e)
+        raise
+
+    with _cache_lock:
+        if _inflight.get(file_path) is pending:
+            del _inflight[file_path]
+        # Skip caching when the document was re-uploaded or deleted while downloading
+        if _generations.get(file_path, 0) == generation:
+            _cache_put_locked(file_path, text)
+    pending.set_result(text)
+    return text, len(data)
+
+
+def download(file_path):
+    """Downloads a stored document, recording its duration and size."""
+    with span("supabase.storage.download"):
+        data = supabase.storage.from_(BUCKET_NAME).download(file_path)
+    count("supabase_download_bytes", len(data))
+    return data
+
+
+def is_document(name):
+    """Returns whether a file in a chat folder is a study document rather than generated output."""
+    return name.lower().endswith(DOCUMENT_SUFFIXES)
+
+
+def list_folder(folder):
+    """Lists every entry of a storage folder, paging past the per-request limit."""
+    files = []
+    while True:
+        with span("supabase.storage.list"):
+            page = supabase.storage.from_(BUCKET_NAME).list(
+                folder, {"limit": LIST_PAGE_SIZE, "offset": len(files)}
+            ) or []
+        files.extend(page)
+        if len(page) < LIST_PAGE_SIZE:
+            return files
+
+
+def _last_used(file):
+    """Sort key for a storage listing entry, most recently used first."""
+    return file.get("last_accessed_at") or file.get("updated_at") or file.get("created_at") or ""
+
+
+class DocumentPrefetch:
+    """Warms the extraction cache for the most recently used documents of a listed chat folder."""
+
+    def __init__(self, chat_folder, files):
+        self.chat_folder = chat_folder
+        self._files = files
+        self._cancelled = threading.Event()
+        self._future = _executor.submit(self._run)
+
+    def cancel(self):
+        """Stops the prefetch before its next download."""
+        self._cancelled.set()
+        self._future.cancel()
+
+    def done(self):
+        return self._future.done()
+
+    def _run(self):
+        with span("prefetch"):
+            self._prefetch()
+
+    def _prefetch(self):
+        for file in sorted(self._files, key=_last_used, reverse=True)[:PREFETCH_MAX_DOCUMENTS]:
+            size = (file.get("metadata") or {}).get("size") or 0
+            file_path = f"{self.chat_folder}{file['name']}"
+            if self._cancelled.is_set():
+                return
+            if size > PREFETCH_MAX_FILE_BYTES or is_cached(file_path):
+                continue
+
+            started = time.monotonic()
+            try:
+                _, downloaded = _fetch(file_path)
+            except Exception:
+                continue  # A failed prefetch is retried by the regular Load path
+
+            # Stay under the bandwidth cap before starting the next download
+            delay = downloaded / PREFETCH_MAX_BYTES_PER_SECOND - (time.monotonic() - started)
+            if delay > 0 and self._cancelled.wait(delay):
+                return
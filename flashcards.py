@@ -1,22 +1,28 @@
 import streamlit as st
+import html
+from metrics import record_usage, span
 
 
 def generate_flashcards(model,text):
     """Generates flashcards using the Gemini API."""
-    response = model.generate_content(f"Create flashcards for the following text. Provide only question and answer format with question on top and its corresponding aswer below, again next question and answer always keep question at the first:\n{text}")
+    with span("gemini.flashcards"):
+        response = model.generate_content(f"Create flashcards for the following text. Provide only question and answer format with question on top and its corresponding aswer below, again next question and answer always keep question at the first:\n{text}")
+    record_usage("gemini_flashcards", response)
     return response.text
 
-flip_card_html = """
+CARDS_PER_PAGE = 12
+
+flip_card_css = """
 <style>
-.flip-card-container {{
+.flip-card-container {
   display: flex;
   flex-wrap: wrap;
   justify-content: space-evenly;
   gap: 20px;
   margin-top: 20px;
-}}
+}
 
-.flip-card {{
+.flip-card {
   background-color: transparent;
   margin: 5px;
   width: 300px;
@@ -24,21 +30,21 @@ flip_card_html = """
   perspective: 1000px;
   border-radius: 10px;
   padding: 10px;
-}}
+}
 
-.flip-card-inner {{
+.flip-card-inner {
   position: relative;
   width: 100%;
   height: 100%;
   transform-style: preserve-3d;
   transition: transform 0.6s;
-}}
+}
 
-.flip-card:hover .flip-card-inner {{
+.flip-card:hover .flip-card-inner {
   transform: rotateY(180deg);
-}}
+}
 
-.flip-card-front, .flip-card-back {{
+.flip-card-front, .flip-card-back {
   position: absolute;
   width: 100%;
   height: 100%;
@@ -48,46 +54,78 @@ flip_card_html = """
   justify-content: center;
   padding: 20px;
   border-radius: 8px;
-}}
+}
 
-.flip-card-front {{
+.flip-card-front {
   background-color: #f0f0f5;
   color: black;
-}}
+}
 
-.flip-card-back {{
+.flip-card-back {
   background-color: #000000;
   color: white;
   transform: rotateY(180deg);
-}}
+}
 </style>
-
-<div class="flip-card-container">
-  <div class="flip-card">
-    <div class="flip-card-inner">
-      <div class="flip-card-front">
-        {front_text}
-      </div>
-      <div class="flip-card-back">
-        {back_text}
-      </div>
-    </div>
-  </div>
-</div>
 """
 
-def show_flashcards(model,text):
-    flashcards = generate_flashcards(model,text)
+flip_card_html = """<div class="flip-card"><div class="flip-card-inner">\
+<div class="flip-card-front">{front_text}</div>\
+<div class="flip-card-back">{back_text}</div>\
+</div></div>"""
+
 
+def parse_flashcards(flashcards):
+    """Pairs the question and answer lines of the Gemini response into (front, back) cards."""
+    cards = []
     flashcard_lines = flashcards.split('\n')
     for i in range(0, len(flashcard_lines), 2):
         card_front = flashcard_lines[i].strip() if i < len(flashcard_lines) else ""
         card_back = flashcard_lines[i + 1].strip() if i + 1 < len(flashcard_lines) else ""
         if card_front and card_back:
-            front_text = card_front.split("**")[-1].strip()
-            back_text = card_back.split("**")[-1].strip()
-            card_html = flip_card_html.format(front_text=front_text, back_text=back_text)
-            st.markdown(card_html, unsafe_allow_html=True)
+            cards.append((card_front.split("**")[-1].strip(), card_back.split("**")[-1].strip()))
+    return cards
+
+
+def render_deck_html(cards):
+    """Renders cards as one grid with a single stylesheet, escaping the card text."""
+    card_html = "".join(
+        flip_card_html.format(front_text=html.escape(front), back_text=html.escape(back))
+        for front, back in cards
+    )
+    return f'{flip_card_css}<div class="flip-card-container">{card_html}</div>'
+
+
+def show_flashcards(model,text):
+    # Generate once per document; paging reruns the script and must not call the model again
+    if st.session_state.get("flashcards_source") != text:
+        st.session_state["flashcards"] = parse_flashcards(generate_flashcards(model,text))
+        st.session_state["flashcards_source"] = text
+        st.session_state["flashcards_page"] = 0
+
+    cards = st.session_state["flashcards"]
+    if not cards:
+        st.warning("No flashcards could be generated from this document.")
+        return
+
+    page_count = (len(cards) + CARDS_PER_PAGE - 1) // CARDS_PER_PAGE
+    page = min(st.session_state.get("flashcards_page", 0), page_count - 1)
+
+    if page_count > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("⬅️ Previous", disabled=page == 0):
+                st.session_state["flashcards_page"] = page - 1
+                st.rerun()
+        with col2:
+            st.write(f"Page {page + 1} of {page_count} ({len(cards)} cards)")
+        with col3:
+            if st.button("Next ➡️", disabled=page == page_count - 1):
+                st.session_state["flashcards_page"] = page + 1
+                st.rerun()
+
+    start = page * CARDS_PER_PAGE
+    st.markdown(render_deck_html(cards[start:start + CARDS_PER_PAGE]), unsafe_allow_html=True)
 
 if __name__ == "__main__":
     show_flashcards()
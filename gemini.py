@@ -0,0 +1,29 @@
+from dotenv import load_dotenv
+from functools import lru_cache
+import os
+
+load_dotenv()
+
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+
+_model_factory = None
+
+
+@lru_cache(maxsize=None)
+def _build_model(model_name):
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai.GenerativeModel(model_name)
+
+
+def use_model_factory(factory):
+    """Builds models with factory(model_name) instead of the Gemini SDK; None restores Gemini."""
+    global _model_factory
+    _model_factory = factory
+
+
+def get_model(model_name):
+    """Configures the Gemini SDK and builds the named model on first use."""
+    if _model_factory is not None:
+        return _model_factory(model_name)
+    return _build_model(model_name)
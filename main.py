@@ -4,20 +4,21 @@ from login import login
 from signup import sign_up
 from datetime import datetime
 from notes import notes_page
-from dotenv import load_dotenv
-import google.generativeai as genai
-import fitz
-import io
+from gemini import get_model
+from documents import DocumentPrefetch, invalidate, is_document, list_folder, load_document
+from metrics import count, metrics_page, span
 import os
-from chatbot import chatbot_interface
+from chatbot import chatbot_interface, open_chat_transcript
 from flashcards import show_flashcards
 from quiz import show_quiz
 
-load_dotenv()
+MODEL_NAME = "gemini-1.5-flash"
+ADMIN_EMAILS = {email.strip() for email in os.environ.get("ADMIN_EMAILS", "").split(",") if email.strip()}
 
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel("gemini-1.5-flash")
+
+def is_admin():
+    """Returns whether the logged-in user may view the performance dashboard."""
+    return st.session_state.get("user_email") in ADMIN_EMAILS
 
 def upload_document():
     """Handles document upload to the selected chat folder in Supabase Storage."""
@@ -40,7 +41,10 @@ def upload_document():
             file_bytes = uploaded_file.read()
 
             # Upload file as bytes
-            supabase.storage.from_(bucket_name).upload(file_path, file_bytes)
+            with span("supabase.storage.upload"):
+                supabase.storage.from_(bucket_name).upload(file_path, file_bytes)
+            count("supabase_upload_bytes", len(file_bytes))
+            invalidate([file_path])
 
             st.sidebar.success(f"Uploaded '{uploaded_file.name}' to '{selected_chat}' successfully!")
         except Exception as e:
@@ -50,7 +54,6 @@ def upload_document():
 def fetch_user_documents():
     """Fetches all documents for the selected chat history from Supabase Storage."""
     user_display_name = st.session_state["username"]
-    bucket_name = "user-documents"
 
     # Ensure a chat is selected
     selected_chat = st.session_state["selected_chat"]
@@ -61,8 +64,7 @@ def fetch_user_documents():
     chat_folder = f"{user_display_name}/{selected_chat}/"
 
     try:
-        response = supabase.storage.from_(bucket_name).list(chat_folder)
-
+        response = [file for file in list_folder(chat_folder) if is_document(file["name"])]
 
         if response:
             return [file["name"] for file in response]
@@ -92,13 +94,20 @@ def sidebar_options():
         st.sidebar.subheader("💬 Chat History")
         user_display_name = st.session_state["username"]
 
-        response = supabase.table("Chat-History").select("id", "name").eq("displayname", user_display_name).execute()
+        with span("supabase.table.chat_history.select"):
+            response = supabase.table("Chat-History").select("id", "name").eq("displayname", user_display_name).execute()
         chat_histories = response.data if response.data else []
 
         chat_options = ["➕ Create New Chat"] + [chat["name"] for chat in chat_histories]
         selected_chat = st.sidebar.selectbox("Select a chat history:", chat_options, index=0)
         st.session_state["selected_chat"] = selected_chat
 
+        # Load the recent transcript only when the selection actually changes
+        chat_id = next((chat["id"] for chat in chat_histories if chat["name"] == selected_chat), None)
+        if "messages" not in st.session_state or st.session_state.get("messages_chat_id") != chat_id:
+            open_chat_transcript(chat_id)
+            start_document_prefetch(user_display_name, selected_chat if chat_id else None)
+
         if selected_chat == "➕ Create New Chat":
             st.session_state["creating_chat"] = True
         else:
@@ -140,28 +149,16 @@ def sidebar_options():
 
             if st.button("📂 Load") and selected_docs:
                 document_contents = []
-                bucket_name = "user-documents"
-
-                for doc in selected_docs:
-                    file_path = f"{user_display_name}/{selected_chat}/{doc}"
-                    print(file_path)
-
-                    try:
-                        response = supabase.storage.from_(bucket_name).download(file_path)
-
-                        if doc.lower().endswith(".pdf"):  # Handle PDFs
-                            pdf_bytes = io.BytesIO(response)  # Convert bytes to file-like object
-
-                            with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf_reader:  # Properly open PDF
-                                pdf_text = "\n\n".join([page.get_text() for page in pdf_reader])
-
-                            document_contents.append(pdf_text)
 
-                        else:  # Handle text-based files normally
-                            document_contents.append(response.decode("utf-8"))
+                with span("action.load_documents"):
+                    for doc in selected_docs:
+                        file_path = f"{user_display_name}/{selected_chat}/{doc}"
 
-                    except Exception as e:
-                        st.sidebar.error(f"Error loading {doc}: {e}")
+                        try:
+                            # Served from the extraction cache when the prefetch already got it
+                            document_contents.append(load_document(file_path))
+                        except Exception as e:
+                            st.sidebar.error(f"Error loading {doc}: {e}")
 
                 if document_contents:
                     st.session_state["selected_document_text"] = "\n\n".join(document_contents)
@@ -191,6 +188,8 @@ def sidebar_options():
             st.session_state["page"] = "notes"
         if st.sidebar.button("📖 Quiz"):
             st.session_state["page"]="quiz"
+        if is_admin() and st.sidebar.button("📊 Performance"):
+            st.session_state["page"] = "metrics"
 
         # Logout Button
         if st.sidebar.button("🚪 Log Out"):
@@ -204,14 +203,38 @@ def sidebar_options():
             st.rerun()
 
 
+def start_document_prefetch(user_display_name, selected_chat):
+    """Lists the newly selected chat's documents and starts downloading them in the background."""
+    previous = st.session_state.pop("document_prefetch", None)
+    if previous:
+        previous.cancel()
+    st.session_state.pop("documents", None)
+    if not selected_chat:
+        return
+
+    # The listing is one quick call; only downloads go to the shared background pool
+    chat_folder = f"{user_display_name}/{selected_chat}/"
+    try:
+        files = [file for file in list_folder(chat_folder) if is_document(file["name"])]
+    except Exception as e:
+        st.sidebar.error(f"Failed to fetch documents: {e}")
+        return
+    st.session_state["documents"] = [file["name"] for file in files]
+    st.session_state["document_prefetch"] = DocumentPrefetch(chat_folder, files)
+
+
 def delete_documents(file_names):
     """Deletes multiple documents from Supabase Storage."""
     try:
         user_display_name = st.session_state["username"]
+        selected_chat = st.session_state["selected_chat"]
         bucket_name = "user-documents"
-        file_paths = [f"{user_display_name}/{file}" for file in file_names]
+        file_paths = [f"{user_display_name}/{selected_chat}/{file}" for file in file_names]
 
-        supabase.storage.from_(bucket_name).remove(file_paths)
+        with span("supabase.storage.remove"):
+            supabase.storage.from_(bucket_name).remove(file_paths)
+        invalidate(file_paths)
+        st.session_state["documents"] = [doc for doc in st.session_state.get("documents", []) if doc not in file_names]
         st.sidebar.success(f"Deleted: {', '.join(file_names)} successfully!")
         st.rerun()
     except Exception as e:
@@ -224,7 +247,8 @@ def save_chat_history(chat_name):
         user_display_name = st.session_state["username"]
 
         # Fetch last chat history ID and increment it
-        response = supabase.table("Chat-History").select("id").order("id", desc=True).limit(1).execute()
+        with span("supabase.table.chat_history.select_last_id"):
+            response = supabase.table("Chat-History").select("id").order("id", desc=True).limit(1).execute()
 
         if response.data:
             last_id = response.data[0]["id"]
@@ -233,12 +257,13 @@ def save_chat_history(chat_name):
         else:
             new_id = "ID0001"
 
-        supabase.table("Chat-History").insert({
-            "id": new_id,
-            "name": chat_name,
-            "created_at": datetime.utcnow().isoformat(),
-            "displayname": user_display_name
-        }).execute()
+        with span("supabase.table.chat_history.insert"):
+            supabase.table("Chat-History").insert({
+                "id": new_id,
+                "name": chat_name,
+                "created_at": datetime.utcnow().isoformat(),
+                "displayname": user_display_name
+            }).execute()
 
         # Create chat folder inside the user's directory
         bucket_name = "user-documents"
@@ -246,7 +271,8 @@ def save_chat_history(chat_name):
         placeholder_file_path = f"{chat_folder}placeholder.txt"
         placeholder_content = b"Folder placeholder"
 
-        supabase.storage.from_(bucket_name).upload(placeholder_file_path, placeholder_content)
+        with span("supabase.storage.upload"):
+            supabase.storage.from_(bucket_name).upload(placeholder_file_path, placeholder_content)
 
         st.sidebar.success(f"Chat history '{chat_name}' created successfully!")
         st.session_state["creating_chat"] = False
@@ -263,7 +289,7 @@ def homepage():
 
     if "user_logged_in" in st.session_state and st.session_state["user_logged_in"]:
         st.success(f"Welcome, {st.session_state['username']}!")
-        model = genai.GenerativeModel("gemini-1.5-flash")
+        model = get_model(MODEL_NAME)
         document_text = st.session_state.get("selected_document_text", "")
         chatbot_interface(model, document_text)
 
@@ -290,16 +316,18 @@ def main():
         homepage()
     elif st.session_state["page"] == "flashcard":
         document_text = st.session_state.get("selected_document_text", "")
-        show_flashcards(model,document_text)
+        show_flashcards(get_model(MODEL_NAME),document_text)
     elif st.session_state["page"] == "quiz":
         document_text = st.session_state.get("selected_document_text", "")
-        show_quiz(model,document_text)
+        show_quiz(get_model(MODEL_NAME),document_text)
     elif st.session_state["page"] == "login":
         login()
     elif st.session_state["page"] == "signup":
         sign_up()
     elif st.session_state["page"] == "notes":
         notes_page()
+    elif st.session_state["page"] == "metrics" and is_admin():
+        metrics_page()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,144 @@
+from collections import defaultdict, deque
+from contextlib import contextmanager
+import threading
+import time
+
+# Most recent durations kept per span for percentiles
+SAMPLES_PER_SPAN = 1000
+# Most recent top-level traces kept for the dashboard
+RECENT_TRACES = 50
+
+_lock = threading.Lock()
+_durations = defaultdict(lambda: deque(maxlen=SAMPLES_PER_SPAN))
+_span_totals = defaultdict(lambda: [0, 0.0])  # name -> [count, total seconds]
+_counters = defaultdict(float)
+_traces = deque(maxlen=RECENT_TRACES)
+_local = threading.local()
+
+
+def percentile(samples, fraction):
+    """Returns the nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+@contextmanager
+def span(name):
+    """Times a block, records it under name and nests it inside any enclosing span."""
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    node = {"name": name, "seconds": 0.0, "children": []}
+    if stack:
+        stack[-1]["children"].append(node)
+    stack.append(node)
+    started = time.perf_counter()
+    try:
+        yield node
+    finally:
+        node["seconds"] = time.perf_counter() - started
+        stack.pop()
+        with _lock:
+            _durations[name].append(node["seconds"])
+            totals = _span_totals[name]
+            totals[0] += 1
+            totals[1] += node["seconds"]
+            if not stack:
+                _traces.append(node)
+
+
+def count(name, value=1):
+    """Adds value to a counter such as bytes downloaded or tokens used."""
+    with _lock:
+        _counters[name] += value
+
+
+def record_usage(prefix, response):
+    """Counts the prompt and output tokens reported on a Gemini response."""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        count(f"{prefix}_prompt_tokens", getattr(usage, "prompt_token_count", 0) or 0)
+        count(f"{prefix}_output_tokens", getattr(usage, "candidates_token_count", 0) or 0)
+
+
+def snapshot():
+    """Returns span statistics, counters and recent traces as plain data."""
+    with _lock:
+        spans = {
+            name: {
+                "count": _span_totals[name][0],
+                "total_seconds": _span_totals[name][1],
+                "p50_seconds": percentile(list(samples), 0.50),
+                "p95_seconds": percentile(list(samples), 0.95),
+            }
+            for name, samples in _durations.items()
+        }
+        return {"spans": spans, "counters": dict(_counters), "traces": list(_traces)}
+
+
+def reset():
+    """Clears all recorded metrics."""
+    with _lock:
+        _durations.clear()
+        _span_totals.clear()
+        _counters.clear()
+        _traces.clear()
+
+
+def prometheus_text():
+    """Renders the current metrics in the Prometheus text exposition format."""
+    data = snapshot()
+    lines = [
+        "# HELP span_duration_seconds Duration of instrumented operations.",
+        "# TYPE span_duration_seconds summary",
+    ]
+    for name, stats in sorted(data["spans"].items()):
+        lines.append(f'span_duration_seconds{{span="{name}",quantile="0.5"}} {stats["p50_seconds"]:.6f}')
+        lines.append(f'span_duration_seconds{{span="{name}",quantile="0.95"}} {stats["p95_seconds"]:.6f}')
+        lines.append(f'span_duration_seconds_sum{{span="{name}"}} {stats["total_seconds"]:.6f}')
+        lines.append(f'span_duration_seconds_count{{span="{name}"}} {stats["count"]}')
+    for name, value in sorted(data["counters"].items()):
+        lines.append(f"# TYPE {name}_total counter")
+        lines.append(f"{name}_total {value:g}")
+    return "\n".join(lines) + "\n"
+
+
+def _flatten_trace(node, depth=0):
+    yield {"span": "  " * depth + node["name"], "ms": round(node["seconds"] * 1000, 1)}
+    for child in node["children"]:
+        yield from _flatten_trace(child, depth + 1)
+
+
+def metrics_page():
+    """Admin-only Streamlit page showing span percentiles, counters and recent traces."""
+    import streamlit as st
+
+    st.title("📊 Performance")
+    data = snapshot()
+
+    st.subheader("Operations")
+    st.dataframe([
+        {
+            "span": name,
+            "count": stats["count"],
+            "p50 ms": round(stats["p50_seconds"] * 1000, 1),
+            "p95 ms": round(stats["p95_seconds"] * 1000, 1),
+            "total s": round(stats["total_seconds"], 2),
+        }
+        for name, stats in sorted(data["spans"].items(), key=lambda item: -item[1]["p95_seconds"])
+    ])
+
+    st.subheader("Counters")
+    st.dataframe([{"counter": name, "value": value} for name, value in sorted(data["counters"].items())])
+
+    st.subheader("Recent actions")
+    for trace in reversed(data["traces"]):
+        with st.expander(f"{trace['name']} — {trace['seconds'] * 1000:.0f} ms"):
+            st.table(list(_flatten_trace(trace)))
+
+    st.download_button("📥 Prometheus export", prometheus_text(), file_name="metrics.txt", mime="text/plain")
+    if st.button("Reset metrics"):
+        reset()
+        st.rerun()
@@ -1,18 +1,12 @@
 import streamlit as st
-import os
 from database import supabase_client as supabase
-from PyPDF2 import PdfReader
-from google.generativeai import configure, GenerativeModel
-from dotenv import load_dotenv
-from docx import Document
+from gemini import get_model
+from metrics import record_usage, span
+from io import BytesIO
 import re
 
-load_dotenv()
-
-# Configure Gemini-1.5-Pro API
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-configure(api_key=GEMINI_API_KEY)
-model = GenerativeModel("gemini-1.5-pro")
+MODEL_NAME = "gemini-1.5-pro"
+ANALYSIS_FAILED = "AI analysis failed."
 
 
 def fetch_document_content(file_name):
@@ -44,71 +38,116 @@ def fetch_document_content(file_name):
         return None
 
 
-def analyze_notes(content, user_prompt):
-    """Uses Gemini AI to analyze and enhance notes."""
+def enhance_notes(content, user_prompt):
+    """Asks Gemini to enhance notes, letting API errors propagate to the caller."""
     prompt = (
         f"Analyze and enhance the following notes for better learning. "
         f"User request: {user_prompt}\n\n{content}"
     )
+    with span("gemini.notes"):
+        response = get_model(MODEL_NAME).generate_content(prompt)
+    record_usage("gemini_notes", response)
+    return response.text if response else ANALYSIS_FAILED
+
+
+def analyze_notes(content, user_prompt):
+    """Uses Gemini AI to analyze and enhance notes."""
     try:
-        response = model.generate_content(prompt)
-        return response.text if response else "AI analysis failed."
+        return enhance_notes(content, user_prompt)
     except Exception as e:
         st.error(f"Error in AI analysis: {e}")
         return None
 
 
-def create_docx(text):
-    """Generates a properly formatted DOCX file from the enhanced notes."""
-    doc = Document()
+_BLOCK_PATTERN = re.compile(
+    r"^(?:(?P<fence>```.*)|(?P<heading>#{1,3}) (?P<heading_text>.*)"
+    r"|[-*] (?P<bullet>.*)|(?P<number>\d+\.\s.*))$"
+)
+_INLINE_PATTERN = re.compile(r"\*\*(?P<bold>.+?)\*\*|\*(?P<italic>.+?)\*|`(?P<code>[^`]+)`")
+_CODE_FONT = "Courier New"
+
 
+def tokenize_markdown(text):
+    """Splits markdown into (kind, payload) block tokens in a single pass."""
+    in_code = False
     for line in text.split("\n"):
-        line = line.strip()
+        if in_code:
+            if line.strip().startswith("```"):
+                in_code = False
+            else:
+                yield "code", line.rstrip()
+            continue
 
+        line = line.strip()
         if not line:
-            doc.add_paragraph("")  # Preserve blank lines
+            yield "blank", ""
             continue
 
-        # Headings (Markdown-style)
-        if line.startswith("# "):
-            doc.add_heading(line[2:], level=1)
-            continue
-        elif line.startswith("## "):
-            doc.add_heading(line[3:], level=2)
-            continue
-        elif line.startswith("### "):
-            doc.add_heading(line[4:], level=3)
-            continue
+        match = _BLOCK_PATTERN.match(line)
+        if match is None:
+            yield "paragraph", line
+        elif match.group("fence"):
+            in_code = True
+        elif match.group("heading"):
+            yield f"heading{len(match.group('heading'))}", match.group("heading_text")
+        elif match.group("bullet") is not None:
+            yield "bullet", match.group("bullet")
+        else:
+            yield "number", match.group("number")
+
+
+def add_inline_runs(para, line):
+    """Adds runs for **bold**, *italic* and `code` spans of a line to a paragraph."""
+    position = 0
+    for match in _INLINE_PATTERN.finditer(line):
+        if match.start() > position:
+            para.add_run(line[position:match.start()])
+        if match.group("bold") is not None:
+            para.add_run(match.group("bold")).bold = True
+        elif match.group("italic") is not None:
+            para.add_run(match.group("italic")).italic = True
+        else:
+            para.add_run(match.group("code")).font.name = _CODE_FONT
+        position = match.end()
+    if position < len(line):
+        para.add_run(line[position:])
 
-        # Bullet Points
-        elif line.startswith(("- ", "* ")):
-            doc.add_paragraph(line[2:], style="ListBullet")
-            continue
 
-        # Numbered List
-        elif re.match(r"^\d+\.\s", line):
-            doc.add_paragraph(line, style="ListNumber")
-            continue
+_DOCX_STYLES = ("Heading 1", "Heading 2", "Heading 3", "List Bullet", "List Number")
+
+
+def create_docx(text):
+    """Generates a properly formatted DOCX file from the enhanced notes and returns its bytes."""
+    from docx import Document  # python-docx is only needed when exporting
+
+    doc = Document()
+
+    # python-docx rescans the style table on every add_paragraph(style=...) call; resolve each id once
+    style_ids = {name: doc.styles[name].style_id for name in _DOCX_STYLES}
 
-        # Handle bold and italic formatting inside paragraphs
+    def styled_paragraph(style_name):
         para = doc.add_paragraph()
-        pattern = re.compile(r"(\*\*.*?\*\*|\*.*?\*)")  # Match **bold** and *italic*
-        matches = pattern.split(line)  # Split line into formatted segments
-
-        for part in matches:
-            if part.startswith("**") and part.endswith("**"):
-                run = para.add_run(part[2:-2])  # Remove ** and apply bold
-                run.bold = True
-            elif part.startswith("*") and part.endswith("*"):
-                run = para.add_run(part[1:-1])  # Remove * and apply italic
-                run.italic = True
-            else:
-                para.add_run(part)  # Add normal text
+        para._p.style = style_ids[style_name]
+        return para
 
-    doc_path = "Enhanced_Notes.docx"
-    doc.save(doc_path)
+    for kind, payload in tokenize_markdown(text):
+        if kind == "blank":
+            doc.add_paragraph("")  # Preserve blank lines
+        elif kind.startswith("heading"):
+            styled_paragraph(f"Heading {kind[-1]}").add_run(payload)
+        elif kind == "bullet":
+            add_inline_runs(styled_paragraph("List Bullet"), payload)
+        elif kind == "number":
+            add_inline_runs(styled_paragraph("List Number"), payload)
+        elif kind == "code":
+            doc.add_paragraph().add_run(payload).font.name = _CODE_FONT
+        else:
+            add_inline_runs(doc.add_paragraph(), payload)
 
-    return doc_path
+    # Build the file in memory so concurrent sessions never share a path on disk
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
 
 def notes_page():
     """Displays the AI-Enhanced Notes page in Streamlit."""
@@ -124,7 +163,8 @@ def notes_page():
     text = ""
     try:
         if isinstance(file_content, bytes):
-            from io import BytesIO
+            from PyPDF2 import PdfReader
+
             pdf_reader = PdfReader(BytesIO(file_content))
             text = "\n".join([page.extract_text() for page in pdf_reader.pages if page.extract_text()])
         else:
@@ -142,8 +182,8 @@ def notes_page():
         st.session_state["enhanced_notes"] = enhanced_notes
         st.markdown(enhanced_notes, unsafe_allow_html=True)
 
-        docx_path = create_docx(enhanced_notes)
-        with open(docx_path, "rb") as docx_file:
-            st.download_button(label="📥 Download Enhanced Notes (DOCX)", data=docx_file,
-                               file_name="Enhanced_Notes.docx",
-                               mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
+        with span("notes.create_docx"):
+            docx_bytes = create_docx(enhanced_notes)
+        st.download_button(label="📥 Download Enhanced Notes (DOCX)", data=docx_bytes,
+                           file_name="Enhanced_Notes.docx",
+                           mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
@@ -1,6 +1,5 @@
 import streamlit as st
-import google.generativeai as genai
-import os
+from metrics import record_usage, span
 
 def initialize_session_state():
     """Initializes session state variables for the quiz."""
@@ -17,20 +16,23 @@ def initialize_session_state():
 
 def generate_quiz(model, text, num_questions):
     """Generates a multiple-choice quiz from the provided text."""
-    response = model.generate_content(
-        f"Create a {num_questions}-question multiple-choice quiz based on the following text:\n"
-        f"For each question, provide four options (A, B, C, D) and specify the correct answer.\n"
-        f"Format:\n"
-        f"Q: [question]\n"
-        f"A) [option1]\n"
-        f"B) [option2]\n"
-        f"C) [option3]\n"
-        f"D) [option4]\n"
-        f"Correct: [correct option letter]\n\n"
-        f"Text:\n{text}"
-    )
+    with span("gemini.quiz"):
+        response = model.generate_content(
+            f"Create a {num_questions}-question multiple-choice quiz based on the following text:\n"
+            f"For each question, provide four options (A, B, C, D) and specify the correct answer.\n"
+            f"Format:\n"
+            f"Q: [question]\n"
+            f"A) [option1]\n"
+            f"B) [option2]\n"
+            f"C) [option3]\n"
+            f"D) [option4]\n"
+            f"Correct: [correct option letter]\n\n"
+            f"Text:\n{text}"
+        )
+    record_usage("gemini_quiz", response)
 
-    return extract_quiz_data(response.text)
+    with span("quiz.parse"):
+        return extract_quiz_data(response.text)
 
 def extract_quiz_data(quiz_text):
     """Parses and extracts structured quiz data from the Gemini response."""